@@ -8,16 +8,22 @@ Handles age verification, cookie prompts, and other barriers.
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
 from pathlib import Path
+from urllib.parse import urljoin
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from src.config import PDF_DIR, SOURCE_URL, NUM_DATASETS
+from src.config import PDF_DIR, SOURCE_URL, NUM_DATASETS, DOWNLOAD_WORKERS
 
 try:
     from selenium import webdriver
     from selenium.webdriver.common.by import By
-    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import NoSuchElementException, TimeoutException
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     print("Error: Required packages not installed")
     print("Install with: pip install selenium requests")
@@ -25,45 +31,93 @@ except ImportError:
 
 
 def setup_driver():
-    """Setup Chrome driver with download preferences."""
+    """Setup headless Chrome with download preferences.
+
+    Only <a href> attributes are read from the page, so images, GPU
+    compositing, extensions and notifications are all turned off.
+    """
     options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--no-sandbox")
     download_dir = str(PDF_DIR.resolve())
     prefs = {
         "download.default_directory": download_dir,
         "download.prompt_for_download": False,
         "download.directory_upgrade": True,
         "plugins.always_open_pdf_externally": True,
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
     }
     options.add_experimental_option("prefs", prefs)
     driver = webdriver.Chrome(options=options)
     return driver
 
 
-def handle_barriers(driver):
-    """Handle age verification, cookie consent, etc."""
-    time.sleep(2)
+def build_session():
+    """Create a pooled requests session.
+
+    The pool is sized above DOWNLOAD_WORKERS so every download thread
+    gets its own keep-alive connection.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(16, DOWNLOAD_WORKERS))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def copy_driver_cookies(driver, session):
+    """Seed the session with the browser's cookies (after barriers are cleared)."""
+    session.cookies.update(requests.utils.cookiejar_from_dict(
+        {c["name"]: c["value"] for c in driver.get_cookies()}
+    ))
+
+
+BARRIER_TEXTS = [
+    "I am 18 or older", "I agree", "Accept", "Continue",
+    "Confirm", "I understand", "Proceed", "Yes", "Enter",
+]
 
-    barrier_texts = [
-        "I am 18 or older", "I agree", "Accept", "Continue",
-        "Confirm", "I understand", "Proceed", "Yes", "Enter",
+
+def _barrier_selectors(button_text):
+    return [
+        f"//button[contains(text(), '{button_text}')]",
+        f"//a[contains(text(), '{button_text}')]",
+        f"//input[@value='{button_text}']",
+        f"//div[contains(@class, 'button')][contains(text(), '{button_text}')]",
+    ]
+
+
+def handle_barriers(driver):
+    """Handle age verification, cookie consent, etc.
+
+    Returns the element that was clicked, or None if there was no barrier.
+    """
+    # Wait until any barrier control is clickable; pages without a
+    # barrier give up after the same 2 s the old fixed sleep took.
+    conditions = [
+        EC.element_to_be_clickable((By.XPATH, selector))
+        for button_text in BARRIER_TEXTS
+        for selector in _barrier_selectors(button_text)
     ]
+    conditions.append(EC.element_to_be_clickable((By.ID, "cookie-accept")))
+    try:
+        WebDriverWait(driver, 2).until(EC.any_of(*conditions))
+    except TimeoutException:
+        return None
 
-    for button_text in barrier_texts:
+    for button_text in BARRIER_TEXTS:
         try:
-            selectors = [
-                f"//button[contains(text(), '{button_text}')]",
-                f"//a[contains(text(), '{button_text}')]",
-                f"//input[@value='{button_text}']",
-                f"//div[contains(@class, 'button')][contains(text(), '{button_text}')]",
-            ]
-            for selector in selectors:
+            for selector in _barrier_selectors(button_text):
                 try:
                     element = driver.find_element(By.XPATH, selector)
                     if element.is_displayed():
                         print(f"  Found barrier button: '{button_text}'")
                         element.click()
-                        time.sleep(2)
-                        return True
+                        return element
                 except NoSuchElementException:
                     continue
         except Exception:
@@ -72,12 +126,37 @@ def handle_barriers(driver):
     try:
         cookie_button = driver.find_element(By.ID, "cookie-accept")
         cookie_button.click()
-        time.sleep(1)
-        return True
+        return cookie_button
     except Exception:
         pass
 
-    return False
+    return None
+
+
+def wait_for_links(driver, timeout=15):
+    """Block until the page has rendered at least one anchor."""
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.TAG_NAME, "a"))
+        )
+    except TimeoutException:
+        pass
+
+
+def wait_after_barrier(driver, clicked, timeout=15):
+    """Block until a barrier click has taken effect.
+
+    The barrier page already has anchors, so waiting for any <a> would
+    return at once. Wait instead for the clicked control to leave the
+    DOM (the page navigated) or for PDF links to appear.
+    """
+    try:
+        WebDriverWait(driver, timeout).until(EC.any_of(
+            EC.staleness_of(clicked),
+            EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='.pdf']")),
+        ))
+    except TimeoutException:
+        pass
 
 
 def extract_pdf_links(driver):
@@ -94,82 +173,178 @@ def extract_pdf_links(driver):
     return links
 
 
-def download_dataset(dataset_num):
-    """Download PDFs for a specific dataset using Selenium."""
-    print(f"\n{'=' * 60}")
-    print(f"Processing Data Set {dataset_num}")
-    print(f"{'=' * 60}")
+class _PdfLinkParser(HTMLParser):
+    """Collect absolute PDF hrefs from <a> tags."""
+
+    def __init__(self, base_url):
+        super().__init__()
+        self.base_url = base_url
+        self.links = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        href = dict(attrs).get("href")
+        if href and ".pdf" in href.lower():
+            self.links.add(urljoin(self.base_url, href))
 
-    dataset_dir = PDF_DIR / f"data-set-{dataset_num}"
-    dataset_dir.mkdir(parents=True, exist_ok=True)
 
-    driver = setup_driver()
+def fast_extract_pdf_links(session, page_url):
+    """Fetch the page over plain HTTP and parse PDF links without a browser.
 
+    Returns an empty set when the page is blocked or JS-gated, so the
+    caller can fall back to Selenium.
+    """
     try:
-        page_url = f"{SOURCE_URL}/data-set-{dataset_num}-files"
-        print(f"Navigating to: {page_url}")
+        response = session.get(page_url, timeout=30)
+        if response.status_code != 200:
+            return set()
+        parser = _PdfLinkParser(page_url)
+        parser.feed(response.text)
+        return parser.links
+    except Exception:
+        return set()
 
-        driver.get(page_url)
-        time.sleep(3)
 
-        print("Checking for age verification or barriers...")
-        if handle_barriers(driver):
-            print("  Clicked through barrier")
-            time.sleep(2)
+def browser_extract_pdf_links(driver, session, page_url, dataset_dir, dataset_num):
+    """Extract PDF links with Selenium, clearing barriers first.
 
-        print("Extracting PDF links...")
-        pdf_links = extract_pdf_links(driver)
-
-        if not pdf_links:
-            print("  No PDF links found")
-            with open(dataset_dir / f"page_source_{dataset_num}.html", "w") as f:
-                f.write(driver.page_source)
-            return 0
-
-        print(f"  Found {len(pdf_links)} PDF link(s)")
-        downloaded = 0
-
-        for link in sorted(pdf_links):
-            filename = os.path.basename(link.split("?")[0])
-            output_path = dataset_dir / filename
-
-            if output_path.exists() and output_path.stat().st_size > 0:
-                # Verify existing file is actually a PDF
-                with open(output_path, "rb") as f:
-                    if f.read(5).startswith(b"%PDF-"):
-                        print(f"  Skipping (exists): {filename}")
-                        downloaded += 1
-                        continue
-
-            print(f"  Downloading: {filename}")
-            try:
-                cookies = driver.get_cookies()
-                session = requests.Session()
-                for cookie in cookies:
-                    session.cookies.set(cookie["name"], cookie["value"])
-
-                response = session.get(link, timeout=30)
-                if response.status_code == 200:
-                    with open(output_path, "wb") as f:
-                        f.write(response.content)
-
-                    with open(output_path, "rb") as f:
-                        if f.read(5).startswith(b"%PDF-"):
-                            print(f"    Valid PDF ({output_path.stat().st_size:,} bytes)")
-                            downloaded += 1
-                        else:
-                            print("    Not a PDF, removing")
-                            output_path.unlink()
-                else:
-                    print(f"    HTTP {response.status_code}")
-            except Exception as e:
-                print(f"    Error: {e}")
-
-        print(f"\nData Set {dataset_num}: Downloaded {downloaded} files")
-        return downloaded
+    Copies the browser's cookies into the session for the downloads.
+    """
+    driver.get(page_url)
+    wait_for_links(driver)
 
-    finally:
-        driver.quit()
+    print("Checking for age verification or barriers...")
+    clicked = handle_barriers(driver)
+    if clicked is not None:
+        print("  Clicked through barrier")
+        wait_after_barrier(driver, clicked)
+
+    print("Extracting PDF links...")
+    pdf_links = extract_pdf_links(driver)
+
+    if not pdf_links:
+        with open(dataset_dir / f"page_source_{dataset_num}.html", "w") as f:
+            f.write(driver.page_source)
+    else:
+        copy_driver_cookies(driver, session)
+    return pdf_links
+
+
+def download_dataset(dataset_num, get_driver, session):
+    """Download PDFs for a specific dataset.
+
+    Tries a direct HTTP fetch of the listing page first and only asks
+    get_driver() for the shared Chrome instance when that yields no links.
+    """
+    print(f"\n{'=' * 60}")
+    print(f"Processing Data Set {dataset_num}")
+    print(f"{'=' * 60}")
+
+    dataset_dir = PDF_DIR / f"data-set-{dataset_num}"
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+
+    page_url = f"{SOURCE_URL}/data-set-{dataset_num}-files"
+    print(f"Fetching: {page_url}")
+
+    pdf_links = fast_extract_pdf_links(session, page_url)
+    used_browser = False
+    if not pdf_links:
+        print("  Direct fetch found no links, falling back to browser")
+        pdf_links = browser_extract_pdf_links(
+            get_driver(), session, page_url, dataset_dir, dataset_num,
+        )
+        used_browser = True
+
+    if not pdf_links:
+        print("  No PDF links found")
+        return 0
+
+    print(f"  Found {len(pdf_links)} PDF link(s)")
+    downloaded, blocked = _download_links(session, pdf_links, dataset_dir)
+
+    # The direct listing fetch carries no browser cookies. If the PDF
+    # GETs need the age-gate/Akamai cookies, the refused files come back as
+    # error pages; clear the barriers in the browser and retry just those
+    # links with its cookies.
+    if not used_browser and blocked:
+        print(f"  {len(blocked)} download(s) refused without browser cookies, "
+              "retrying via browser")
+        browser_extract_pdf_links(
+            get_driver(), session, page_url, dataset_dir, dataset_num,
+        )
+        retried, _ = _download_links(session, blocked, dataset_dir)
+        downloaded += retried
+
+    print(f"\nData Set {dataset_num}: Downloaded {downloaded} files")
+    return downloaded
+
+
+def _fetch(session, link, dataset_dir):
+    """Download one PDF link. Returns (ok, blocked, message).
+
+    blocked is True when the server answered with an error status or a
+    non-PDF body, the signs of a missing barrier cookie.
+    """
+    filename = os.path.basename(link.split("?")[0])
+    output_path = dataset_dir / filename
+
+    if output_path.exists() and output_path.stat().st_size > 0:
+        # Verify existing file is actually a PDF
+        with open(output_path, "rb") as f:
+            if f.read(5).startswith(b"%PDF-"):
+                return True, False, f"  Skipping (exists): {filename}"
+
+    tmp_path = output_path.with_suffix(output_path.suffix + ".part")
+    try:
+        with session.get(link, stream=True, timeout=30) as response:
+            if response.status_code != 200:
+                return False, True, f"  {filename}: HTTP {response.status_code}"
+
+            # Validate the magic bytes from the first chunk, then stream the
+            # rest straight to disk without buffering the whole PDF.
+            chunks = response.iter_content(chunk_size=65536)
+            first = next(chunks, b"")
+            if not first.startswith(b"%PDF-"):
+                return False, True, f"  {filename}: not a PDF, skipped"
+
+            # Write to a .part file and rename on success, so a connection
+            # dropped mid-body never leaves a truncated PDF under the final
+            # name (it would pass the magic check and be skipped next run).
+            size = len(first)
+            with open(tmp_path, "wb") as f:
+                f.write(first)
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+
+        os.replace(tmp_path, output_path)
+        return True, False, f"  Downloaded: {filename} ({size:,} bytes)"
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        return False, False, f"  {filename}: error: {e}"
+
+
+def _download_links(session, pdf_links, dataset_dir):
+    """Download PDF links concurrently with a shared session.
+
+    Returns (valid file count, list of links whose responses looked blocked).
+    """
+    downloaded = 0
+    blocked = []
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        futures = {
+            pool.submit(_fetch, session, link, dataset_dir): link
+            for link in sorted(pdf_links)
+        }
+        for future in as_completed(futures):
+            ok, was_blocked, message = future.result()
+            print(message)
+            if ok:
+                downloaded += 1
+            if was_blocked:
+                blocked.append(futures[future])
+    return downloaded, blocked
 
 
 def main():
@@ -179,10 +354,26 @@ def main():
     PDF_DIR.mkdir(exist_ok=True)
     total = 0
 
-    for i in range(1, NUM_DATASETS + 1):
-        count = download_dataset(i)
-        total += count
-        time.sleep(2)
+    # One session and (at most) one Chrome instance for the whole run.
+    # Chrome is only started the first time a dataset needs the browser.
+    session = build_session()
+    driver = None
+
+    def get_driver():
+        nonlocal driver
+        if driver is None:
+            driver = setup_driver()
+        return driver
+
+    try:
+        for i in range(1, NUM_DATASETS + 1):
+            count = download_dataset(i, get_driver, session)
+            total += count
+            time.sleep(2)
+    finally:
+        if driver is not None:
+            driver.quit()
+        session.close()
 
     print(f"\n{'=' * 60}")
     print(f"Complete! Total PDFs downloaded: {total}")
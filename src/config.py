@@ -3,10 +3,14 @@ Centralized configuration for the Epstein DOJ Files project.
 All paths, ports, and security settings in one place.
 """
 
+import os
 from pathlib import Path
 
-# Project root (parent of src/)
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Project root (parent of src/). EPSTEIN_PROJECT_ROOT overrides it, e.g. to
+# point at a data checkout elsewhere; it also skips the resolve() walk.
+PROJECT_ROOT = Path(
+    os.environ.get("EPSTEIN_PROJECT_ROOT") or Path(__file__).resolve().parent.parent
+)
 
 # Directories
 STATIC_DIR = PROJECT_ROOT / "static"
@@ -29,16 +33,22 @@ JSON_SUMMARY = "epstein_pdfs_summary.json"
 JSON_FILE_LIST = "epstein_pdfs_file_list.json"
 
 # Allowed file extensions the server may serve
-ALLOWED_EXTENSIONS = {".html", ".json", ".pdf", ".css", ".js", ".png", ".jpg", ".ico"}
+ALLOWED_EXTENSIONS = frozenset({".html", ".json", ".pdf", ".css", ".js", ".png", ".jpg", ".ico"})
 
 # Download settings
 DOWNLOAD_WORKERS = 10      # Concurrent PDF download threads
 DOWNLOAD_BATCH_SIZE = 10   # Pages to scan before downloading (memory management)
 PAGE_FETCH_DELAY = 2.0     # Seconds between page requests (Akamai rate limiting)
+PAGE_FETCH_MAX_DELAY = 30.0  # Backoff ceiling when pages come back empty/blocked
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # Bytes per streamed read when saving a PDF
+URL_CACHE_MAX_AGE = 24 * 60 * 60  # Seconds before a cached link list is rescanned
+
+# Extraction settings
+EXTRACT_WORKERS = os.cpu_count() or 1  # Parallel PDF extraction processes
 
 # Auto-reload settings
-WATCH_EXTENSIONS = {".py", ".html", ".css", ".js"}
-WATCH_DIRS = [
+WATCH_EXTENSIONS = frozenset({".py", ".html", ".css", ".js"})
+WATCH_DIRS = (
     str(PROJECT_ROOT / "src"),
     str(PROJECT_ROOT / "static"),
-]
+)
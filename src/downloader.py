@@ -9,6 +9,10 @@ bot detection, then downloads PDFs via requests with multithreading.
 Headed mode is required — Akamai blocks headless browsers from accessing
 paginated pages (returns 403 Access Denied on ?page=N).
 
+Once the browser has cleared the barriers, later listing pages are fetched
+over plain HTTP with its cookies; if Akamai refuses that, the rest of the
+dataset is scanned through the browser as before.
+
 Pages are processed in batches (default 10): scan a batch of pages for
 PDF links, download them with a thread pool, free memory, then continue.
 This keeps memory usage low even for datasets with thousands of pages.
@@ -21,27 +25,40 @@ Usage:
     python -m src.downloader --batch-size 20     # Scan 20 pages per batch
     python -m src.downloader --dry-run           # Count files without downloading
     python -m src.downloader --headless          # Headless mode (page 0 only)
+    python -m src.downloader --rescan            # Ignore cached link lists
+    python -m src.downloader --refresh           # Re-check downloaded files
 """
 
 import argparse
+import functools
+import hashlib
 import os
 import re
+import shutil
 import sys
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from pathlib import Path
-from urllib.parse import urljoin
-
-import requests
-from playwright.sync_api import sync_playwright, TimeoutError as PwTimeout
-from playwright_stealth import Stealth
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from pathlib import Path, PurePosixPath
+from urllib.parse import unquote, urljoin, urlsplit
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src import jsonio
 from src.config import (
-    PDF_DIR, SOURCE_URL, NUM_DATASETS,
+    DATA_DIR, PDF_DIR, SOURCE_URL, NUM_DATASETS,
     DOWNLOAD_WORKERS, DOWNLOAD_BATCH_SIZE, PAGE_FETCH_DELAY,
+    PAGE_FETCH_MAX_DELAY, DOWNLOAD_CHUNK_SIZE, URL_CACHE_MAX_AGE,
 )
 
+_PAGE_NUM_RE = re.compile(r"[?&]page=(\d+)")
+
+# Elements that mean a listing page has rendered its content
+LISTING_SELECTOR = "a[href*='.pdf'], nav[aria-label='Pagination']"
+ROBOT_BUTTON_SELECTOR = "button:has-text('I am not a robot')"
+
+LOG_FLUSH_LINES = 25  # Buffered download result lines per stdout write
+
 
 # ─── Browser Page Fetching ───────────────────────────────────
 
@@ -55,7 +72,7 @@ def handle_barriers(page):
             robot_btn.click()
             page.wait_for_load_state("networkidle", timeout=10000)
             time.sleep(2)
-    except (PwTimeout, Exception):
+    except Exception:
         pass
 
     # Age verification — "Yes" button for 18+ check
@@ -67,55 +84,87 @@ def handle_barriers(page):
                 print("  Clicking age verification 'Yes'...")
                 yes_btn.click()
                 time.sleep(1)
-    except (PwTimeout, Exception):
+    except Exception:
         pass
 
 
 def get_last_page_from_browser(page):
-    """Extract the last page number from pagination in the browser DOM."""
-    # Look for "Last" link first
-    last_link = page.locator("a:has-text('Last')")
-    try:
-        if last_link.count() > 0:
-            href = last_link.first.get_attribute("href")
-            if href:
-                match = re.search(r"[?&]page=(\d+)", href)
-                if match:
-                    return int(match.group(1))
-    except Exception:
-        pass
+    """Extract the last page number from pagination in the browser DOM.
 
-    # Fallback: find highest page number in pagination links
-    max_page = 0
-    pagination_links = page.locator("nav[aria-label='Pagination'] a[href*='page=']")
+    Both the "Last" link and the numbered pagination links are read in a
+    single evaluate call instead of a CDP round-trip per locator query.
+    """
     try:
-        count = pagination_links.count()
-        for i in range(count):
-            href = pagination_links.nth(i).get_attribute("href")
-            if href:
-                match = re.search(r"[?&]page=(\d+)", href)
-                if match:
-                    max_page = max(max_page, int(match.group(1)))
+        last_hrefs, pagination_hrefs = page.evaluate("""() => {
+            const href = a => a.getAttribute("href") || "";
+            const last = Array.from(document.querySelectorAll("a"))
+                .filter(a => /last/i.test(a.textContent))
+                .map(href);
+            const numbered = Array.from(
+                document.querySelectorAll("nav[aria-label='Pagination'] a[href*='page=']"),
+                href,
+            );
+            return [last, numbered];
+        }""")
     except Exception:
-        pass
+        return 0
 
-    return max_page
+    # Prefer the "Last" link
+    for href in last_hrefs:
+        match = _PAGE_NUM_RE.search(href)
+        if match:
+            return int(match.group(1))
 
+    # Fallback: highest page number in pagination links
+    page_numbers = (_PAGE_NUM_RE.search(href) for href in pagination_hrefs)
+    return max((int(m.group(1)) for m in page_numbers if m), default=0)
 
-def extract_pdf_links_from_browser(page, base_url):
-    """Extract all PDF download URLs from the current browser page."""
-    links = set()
-    all_anchors = page.locator("a[href*='.pdf']")
+
+def extract_pdf_links_from_browser(page):
+    """Extract all PDF download URLs from the current browser page.
+
+    Collects every href in a single evaluate call rather than one CDP
+    round-trip per anchor. ``a.href`` is already resolved to an absolute
+    URL by the browser, and duplicates are dropped in the page before
+    serialization.
+    """
     try:
-        count = all_anchors.count()
-        for i in range(count):
-            href = all_anchors.nth(i).get_attribute("href")
-            if href:
-                full_url = urljoin(base_url, href)
-                links.add(full_url)
+        hrefs = page.eval_on_selector_all(
+            "a[href*='.pdf']",
+            "els => Array.from(new Set(els.map(a => a.href).filter(Boolean)))",
+        )
     except Exception:
-        pass
-    return links
+        return set()
+    return set(hrefs)
+
+
+class PagePacer:
+    """Rate-limit pagination fetches with adaptive backoff.
+
+    The delay is measured from the start of the previous fetch, so time
+    spent loading a page counts towards it instead of being added on top.
+    An empty page (Akamai block or failed load) doubles the delay up to
+    max_delay; each successful page eases it back towards base_delay.
+    """
+
+    def __init__(self, base_delay, max_delay):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.delay = base_delay
+        self._last_start = None
+
+    def wait(self):
+        if self._last_start is not None:
+            remaining = self.delay - (time.monotonic() - self._last_start)
+            if remaining > 0:
+                time.sleep(remaining)
+        self._last_start = time.monotonic()
+
+    def record(self, ok):
+        if ok:
+            self.delay = max(self.base_delay, self.delay - self.base_delay)
+        else:
+            self.delay = min(self.max_delay, self.delay * 2)
 
 
 def fetch_page_links(page, base_url, page_num):
@@ -123,15 +172,19 @@ def fetch_page_links(page, base_url, page_num):
 
     Returns a set of PDF URLs found on the page.
     """
+    from playwright.sync_api import TimeoutError as PwTimeout
+
     page_url = f"{base_url}?page={page_num}" if page_num > 0 else base_url
 
+    # Stop waiting as soon as the listing is in the DOM; "networkidle"
+    # would also wait out the site's analytics beacons. It is kept only
+    # as the last-ditch retry.
     try:
-        page.goto(page_url, wait_until="networkidle", timeout=30000)
-        time.sleep(1)
+        page.goto(page_url, wait_until="domcontentloaded", timeout=30000)
+        page.wait_for_selector(LISTING_SELECTOR, timeout=15000)
     except PwTimeout:
         try:
-            page.goto(page_url, wait_until="domcontentloaded", timeout=30000)
-            time.sleep(2)
+            page.goto(page_url, wait_until="networkidle", timeout=30000)
         except Exception:
             print(f"    Page {page_num}: FAILED")
             return set()
@@ -139,52 +192,417 @@ def fetch_page_links(page, base_url, page_num):
     # Extract links before any barrier clicks — PDF links are already
     # in the DOM, and clicking age verification triggers a Drupal AJAX
     # reload that clears the content.
-    return extract_pdf_links_from_browser(page, page_url)
+    return extract_pdf_links_from_browser(page)
+
+
+class _PdfLinkParser(HTMLParser):
+    """Collect absolute PDF hrefs from <a> tags in a listing page."""
+
+    def __init__(self, base_url):
+        super().__init__()
+        self.base_url = base_url
+        self.links = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        href = dict(attrs).get("href")
+        if href and ".pdf" in href:
+            self.links.add(urljoin(self.base_url, href))
+
+
+def fetch_page_links_http(session, base_url, page_num):
+    """Fetch a listing page over plain HTTP and extract PDF links.
+
+    Much cheaper than a browser navigation once the Akamai cookies are in
+    the session. Returns None when the request fails, is refused, or
+    yields no links (e.g. a challenge page), so the caller can fall back
+    to fetch_page_links().
+    """
+    page_url = f"{base_url}?page={page_num}" if page_num > 0 else base_url
+    try:
+        response = session.get(page_url, timeout=30)
+    except Exception:
+        return None
+    if response.status_code != 200:
+        return None
+
+    parser = _PdfLinkParser(page_url)
+    parser.feed(response.text)
+    return parser.links or None
+
+
+# ─── Link Cache ──────────────────────────────────────────────
+
+def url_cache_path(dataset_num):
+    """Path of the cached per-page link list for a dataset."""
+    return DATA_DIR / f"data-set-{dataset_num}.urls.json"
+
+
+def url_cache_fingerprint(last_page, first_links):
+    """Hash the page count and page-0 links that identify a listing."""
+    digest = hashlib.sha256(str(last_page).encode())
+    for url in sorted(first_links):
+        digest.update(b"\n" + url.encode())
+    return digest.hexdigest()
+
+
+def load_url_cache(dataset_num, fingerprint):
+    """Return cached per-page link lists if the fingerprint still matches.
+
+    The fingerprint only covers page 0, so files added on later pages go
+    unnoticed until the cache is older than URL_CACHE_MAX_AGE.
+    """
+    try:
+        cache = jsonio.load_file(url_cache_path(dataset_num))
+        fetched_at = datetime.fromisoformat(cache["fetched_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if cache.get("index_hash") != fingerprint:
+        return None
+    age = datetime.now(timezone.utc) - fetched_at
+    if age.total_seconds() > URL_CACHE_MAX_AGE:
+        return None
+    return cache.get("pages")
+
+
+def save_url_cache(dataset_num, fingerprint, pages):
+    """Write the per-page link lists from a complete scan."""
+    path = url_cache_path(dataset_num)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    jsonio.dump_file(path, {
+        "index_hash": fingerprint,
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+        "pages": pages,
+    })
+
+
+# ─── Validator Cache ─────────────────────────────────────────
+
+def validator_cache_path(dataset_num):
+    """Path of the recorded ETag/Last-Modified headers for a dataset."""
+    return DATA_DIR / f"data-set-{dataset_num}.validators.json"
+
+
+def load_validators(dataset_num):
+    """Return {url: {"etag", "last_modified", "size"}} from earlier downloads."""
+    try:
+        return jsonio.load_file(validator_cache_path(dataset_num))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_validators(dataset_num, validators):
+    """Write the recorded validators for a dataset."""
+    path = validator_cache_path(dataset_num)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    jsonio.dump_file(path, validators)
+
+
+def _conditional_headers(validator):
+    """If-None-Match / If-Modified-Since headers for a recorded validator."""
+    headers = {}
+    if validator.get("etag"):
+        headers["If-None-Match"] = validator["etag"]
+    if validator.get("last_modified"):
+        headers["If-Modified-Since"] = validator["last_modified"]
+    return headers
 
 
 # ─── PDF Download ────────────────────────────────────────────
 
+def build_session(browser_context, user_agent, workers):
+    """Create a requests session that carries the browser's Akamai cookies.
+
+    The connection pool is sized to the worker count so every download
+    thread keeps its own keep-alive connection instead of urllib3
+    discarding surplus connections and re-handshaking TLS. Transient
+    errors and 429/5xx responses are retried with exponential backoff.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.request import ACCEPT_ENCODING
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "HEAD"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=workers, pool_maxsize=workers, max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # Only the cookies that apply to the DOJ site (Akamai, age gate) —
+    # not analytics and third-party cookies from every other domain.
+    for cookie in browser_context.cookies([SOURCE_URL]):
+        session.cookies.set(cookie["name"], cookie["value"],
+                            domain=cookie.get("domain", ""))
+    # Advertise every encoding urllib3 can decode here (br/zstd only when
+    # their optional packages are installed); iter_content decodes them.
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "Connection": "keep-alive",
+    })
+    return session
+
+
+@functools.lru_cache(maxsize=65536)
+def url_to_filename(url):
+    """Local filename for a PDF URL: the last segment of the decoded path.
+
+    The path is percent-decoded before the basename is taken, so an
+    encoded %2F cannot smuggle a separator into the name. Returns None
+    when the result is not safe to use as a filename.
+    """
+    name = PurePosixPath(unquote(urlsplit(url).path)).name
+    if name in ("", ".", "..") or "\\" in name or "\0" in name:
+        return None
+    return name
+
+
+def legacy_filename(url):
+    """Filename older versions saved a URL under (the undecoded segment)."""
+    return PurePosixPath(urlsplit(url).path).name
+
+
 def is_valid_pdf(filepath):
-    """Check if a file exists and starts with the PDF magic bytes."""
+    """Check if a file is a complete PDF.
+
+    Requires the %PDF- magic at the start and an %%EOF marker in the last
+    1 KB, so files truncated by an interrupted download are fetched again.
+    """
     try:
-        if filepath.exists() and filepath.stat().st_size > 0:
-            with open(filepath, "rb") as f:
-                return f.read(5).startswith(b"%PDF-")
-    except Exception:
-        pass
-    return False
+        fd = os.open(filepath, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError:
+        return False
+    try:
+        if os.read(fd, 5) != b"%PDF-":
+            return False
+        size = os.fstat(fd).st_size
+        tail_offset = max(0, size - 1024)
+        if hasattr(os, "pread"):
+            return b"%%EOF" in os.pread(fd, 1024, tail_offset)
+        os.lseek(fd, tail_offset, os.SEEK_SET)
+        return b"%%EOF" in os.read(fd, 1024)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
 
 
-def download_pdf(url, output_path, session):
-    """Download a single PDF file. Returns (url, success, message)."""
-    filename = output_path.name
+def _preallocate(f, headers):
+    """Reserve the file's full size up front when the length is known.
 
-    if is_valid_pdf(output_path):
-        return url, True, "skip"
+    One allocation instead of growing extent by extent keeps large PDFs
+    contiguous. Skipped for content-encoded bodies, whose decoded size
+    differs from Content-Length, and on platforms without posix_fallocate.
+    """
+    length = headers.get("Content-Length")
+    if not length or headers.get("Content-Encoding") or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(f.fileno(), 0, int(length))
+    except (OSError, ValueError):
+        pass
 
+
+def _probe_unchanged(url, output_path, session):
+    """HEAD the URL and compare Content-Length with the local file size.
+
+    Returns a validator for the file when the sizes match, else None.
+    """
     try:
-        response = session.get(url, timeout=60)
-        if response.status_code != 200:
-            return url, False, f"  HTTP {response.status_code}: {filename}"
+        response = session.head(url, timeout=(10, 15), allow_redirects=True)
+    except Exception:
+        return None
+    length = response.headers.get("Content-Length")
+    if (response.status_code != 200 or not length
+            or response.headers.get("Content-Encoding")):
+        return None
+    size = output_path.stat().st_size
+    if int(length) != size:
+        return None
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "size": size,
+    }
+
+
+def link_pdf(source, tmp_path, output_path):
+    """Publish an already-downloaded copy of a PDF under output_path.
+
+    Hard-links when the filesystem allows it and copies otherwise.
+    """
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, output_path)
+
+
+def download_pdf(url, output_path, session, exists=True, refresh=False,
+                 validator=None, source=None):
+    """Download a single PDF file. Returns (url, success, message, validator).
+
+    exists=False means the caller's directory listing has no file under
+    this name, so the local validity check is skipped without opening it.
+
+    A complete local file is normally skipped without any request. With
+    refresh, it is revalidated instead: by conditional GET when validator
+    (the headers recorded for an earlier download) is known, otherwise by
+    a HEAD probe of its size. It is only fetched again if it changed.
 
-        if not response.content[:5].startswith(b"%PDF-"):
-            return url, False, f"  Not a PDF: {filename}"
+    source is a complete copy of the same URL saved earlier in this run
+    (under another dataset); a missing file is linked to it, not fetched.
+    """
+    from requests.exceptions import Timeout
 
-        with open(output_path, "wb") as f:
-            f.write(response.content)
+    filename = output_path.name
 
-        size = output_path.stat().st_size
-        return url, True, f"  Downloaded: {filename} ({size:,} bytes)"
+    request_headers = None
+    if exists and is_valid_pdf(output_path):
+        if not refresh:
+            return url, True, "skip", None
+        request_headers = _conditional_headers(validator or {})
+        if not request_headers:
+            # Downloaded before validators were recorded
+            probed = _probe_unchanged(url, output_path, session)
+            if probed is not None:
+                return url, True, "skip", probed
+
+    # Stream into a .part file and rename on success, so an interrupted
+    # download never leaves a truncated PDF under the final name.
+    tmp_path = output_path.with_suffix(output_path.suffix + ".part")
+
+    if source is not None and request_headers is None:
+        try:
+            link_pdf(source, tmp_path, output_path)
+            return url, True, f"  Linked: {filename} (same URL as {source})", None
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
 
-    except requests.exceptions.Timeout:
-        return url, False, f"  Timeout: {filename}"
+    try:
+        with session.get(url, headers=request_headers, timeout=(10, 60),
+                         stream=True) as response:
+            if response.status_code == 304:
+                return url, True, "skip", validator
+            if response.status_code != 200:
+                return url, False, f"  HTTP {response.status_code}: {filename}", None
+
+            # An HTML body is a block or age-gate page, not the PDF; reject
+            # it from the headers without reading any of it.
+            content_type = response.headers.get("Content-Type", "")
+            if content_type.startswith("text/html"):
+                return url, False, f"  Not a PDF (HTML page): {filename}", None
+
+            chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            first = next(chunks, b"")
+            if not first.startswith(b"%PDF-"):
+                return url, False, f"  Not a PDF: {filename}", None
+
+            size = len(first)
+            # A 1 MB buffer coalesces the 64 KB chunks into one write(2)
+            # per megabyte instead of one per chunk.
+            with open(tmp_path, "wb", buffering=1 << 20) as f:
+                _preallocate(f, response.headers)
+                f.write(first)
+                tail = first[-1024:]
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+                    tail = (chunk[-1024:] if len(chunk) >= 1024
+                            else (tail + chunk)[-1024:])
+                f.truncate(size)
+                f.flush()
+                # Files are write-once here; let the kernel drop them from
+                # the page cache instead of evicting something useful.
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+            # Same trailer rule as is_valid_pdf: a file it would reject
+            # must not be published, or every later run fetches it again.
+            if b"%%EOF" not in tail:
+                tmp_path.unlink(missing_ok=True)
+                return (url, False,
+                        f"  Incomplete PDF (no %%EOF in last 1 KB): {filename}",
+                        None)
+
+            new_validator = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "size": size,
+            }
+
+        os.replace(tmp_path, output_path)
+        return (url, True, f"  Downloaded: {filename} ({size:,} bytes)",
+                new_validator)
+
+    except Timeout:
+        tmp_path.unlink(missing_ok=True)
+        return url, False, f"  Timeout: {filename}", None
     except Exception as e:
-        return url, False, f"  Error: {filename} — {e}"
+        tmp_path.unlink(missing_ok=True)
+        return url, False, f"  Error: {filename} — {e}", None
+
+
+def existing_file_names(directory):
+    """Names of the regular files in directory (empty set if missing).
+
+    Uses the file type cached by scandir, so on Linux this is one listing
+    with no per-file stat. Presence only: contents are not checked.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return set()
 
 
-def download_batch(pdf_links, dataset_dir, session, workers):
-    """Download a batch of PDFs using a thread pool.
+def download_jobs(pdf_links, dataset_dir, seen_names, existing_names):
+    """Pair each PDF URL with its output path in the dataset directory.
 
+    URLs whose filename is already in seen_names (from this or an earlier
+    batch of the dataset) are dropped, and new names are added to it, so
+    the same PDF is never scheduled twice or written by two threads.
+    A file already saved under its old undecoded name (e.g.
+    "EFTA%2000001.pdf") keeps that name, so it is not fetched again and
+    indexed twice. URLs without a safe filename are skipped.
+    """
+    jobs = []
+    for url in pdf_links:
+        filename = url_to_filename(url)
+        if filename is None:
+            print(f"    Skipping URL without a safe filename: {url}")
+            continue
+        legacy = legacy_filename(url)
+        if legacy != filename and legacy in existing_names:
+            filename = legacy
+        if filename in seen_names:
+            continue
+        seen_names.add(filename)
+        jobs.append((url, dataset_dir / filename))
+    return jobs
+
+
+def download_batch(jobs, session, workers, existing_names, validators,
+                   saved_urls, refresh=False):
+    """Download a batch of (url, output_path) jobs using a thread pool.
+
+    existing_names is the dataset directory listing; only files named in
+    it are opened to check whether they are already complete. validators
+    is updated in place with the headers of every new download; with
+    refresh, existing files are revalidated against it. saved_urls maps
+    each URL saved so far in this run to its path, and is updated in
+    place, so a URL listed by more than one dataset is fetched only once.
     Returns (downloaded, skipped, failed) counts.
     """
     downloaded = 0
@@ -192,32 +610,63 @@ def download_batch(pdf_links, dataset_dir, session, workers):
     failed = 0
 
     with ThreadPoolExecutor(max_workers=workers) as pool:
-        futures = {}
-        for url in pdf_links:
-            filename = os.path.basename(url.split("?")[0])
-            output_path = dataset_dir / filename
-            future = pool.submit(download_pdf, url, output_path, session)
-            futures[future] = url
-
+        futures = {
+            pool.submit(download_pdf, url, output_path, session,
+                        output_path.name in existing_names, refresh,
+                        validators.get(url), saved_urls.get(url)): output_path
+            for url, output_path in jobs
+        }
+
+        # Collect result lines and write them in blocks: a terminal flushes
+        # stdout per line, so printing each completion costs a syscall.
+        pending_lines = []
         for future in as_completed(futures):
-            url, success, message = future.result()
+            url, success, message, validator = future.result()
+            if validator:
+                validators[url] = validator
             if success:
+                saved_urls.setdefault(url, futures[future])
                 if message == "skip":
                     skipped += 1
                 else:
                     downloaded += 1
-                    print(message)
+                    pending_lines.append(message)
             else:
                 failed += 1
-                print(message)
+                pending_lines.append(message)
+
+            if len(pending_lines) >= LOG_FLUSH_LINES:
+                _write_lines(pending_lines)
+        _write_lines(pending_lines)
 
     return downloaded, skipped, failed
 
 
+def _write_lines(lines):
+    """Write and clear buffered output lines with a single stdout write."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+        lines.clear()
+
+
 # ─── Dataset Download ────────────────────────────────────────
 
-def download_dataset(dataset_num, workers, batch_size, dry_run, browser_context):
-    """Download all PDFs for one dataset, processing pages in batches."""
+def new_stealth_page(browser_context):
+    """Open a new page with the stealth patches applied."""
+    from playwright_stealth import Stealth
+
+    page = browser_context.new_page()
+    Stealth().apply_stealth_sync(page)
+    return page
+
+
+def download_dataset(dataset_num, workers, batch_size, dry_run, browser_context,
+                     user_agent, saved_urls, rescan=False, refresh=False):
+    """Download all PDFs for one dataset, processing pages in batches.
+
+    saved_urls ({url: path}) is shared across the datasets of a run.
+    """
     print(f"\n{'=' * 70}")
     print(f"  Data Set {dataset_num}")
     print(f"{'=' * 70}")
@@ -226,15 +675,22 @@ def download_dataset(dataset_num, workers, batch_size, dry_run, browser_context)
     if not dry_run:
         dataset_dir.mkdir(parents=True, exist_ok=True)
 
+    from playwright.sync_api import TimeoutError as PwTimeout
+
     base_url = f"{SOURCE_URL}/data-set-{dataset_num}-files"
-    page = browser_context.new_page()
-    Stealth().apply_stealth_sync(page)
+    page = new_stealth_page(browser_context)
+    session = None
 
     try:
         # Navigate to first page and handle barriers
         print(f"  Navigating to: {base_url}")
-        page.goto(base_url, wait_until="networkidle", timeout=30000)
-        time.sleep(2)
+        page.goto(base_url, wait_until="domcontentloaded", timeout=30000)
+        try:
+            page.wait_for_selector(
+                f"{LISTING_SELECTOR}, {ROBOT_BUTTON_SELECTOR}", timeout=15000,
+            )
+        except PwTimeout:
+            pass
         handle_barriers(page)
 
         # Discover pagination
@@ -242,23 +698,43 @@ def download_dataset(dataset_num, workers, batch_size, dry_run, browser_context)
         total_pages = last_page + 1
         print(f"  Pages: {total_pages} (page 0 to {last_page})")
 
-        # Set up requests session for downloads (reused across batches)
-        session = None
-        if not dry_run:
-            session = requests.Session()
-            cookies = browser_context.cookies()
-            for cookie in cookies:
-                session.cookies.set(cookie["name"], cookie["value"],
-                                    domain=cookie.get("domain", ""))
-            session.headers.update({
-                "User-Agent": page.evaluate("() => navigator.userAgent"),
-            })
+        # Set up requests session (reused across batches). It carries the
+        # barrier-cleared cookies, so listing pages can be tried over plain
+        # HTTP before falling back to the browser.
+        session = build_session(browser_context, user_agent, workers)
+        use_http = True
+
+        # Page 0 doubles as the fingerprint for the cached link list: if
+        # the page count and first page of links are unchanged, reuse the
+        # links from the last full scan instead of walking every page.
+        pacer = PagePacer(PAGE_FETCH_DELAY, PAGE_FETCH_MAX_DELAY)
+        pacer.wait()
+        first_links = fetch_page_links(page, base_url, 0)
+        pacer.record(bool(first_links))
+
+        fingerprint = url_cache_fingerprint(last_page, first_links)
+        cached_pages = None
+        if first_links and not rescan:
+            cached_pages = load_url_cache(dataset_num, fingerprint)
+            if cached_pages is not None and len(cached_pages) != total_pages:
+                cached_pages = None
+            if cached_pages is not None:
+                print("  Listing unchanged since last scan — using cached links")
+        scanned_pages = []
+        scan_complete = True
+
+        # One directory listing per dataset: dry runs report presence from
+        # it (without checking contents), and downloads only open and
+        # validate files that are actually present.
+        existing_names = existing_file_names(dataset_dir)
+        validators = {} if dry_run else load_validators(dataset_num)
 
         # Process pages in batches
         total_downloaded = 0
         total_skipped = 0
         total_failed = 0
         total_links = 0
+        seen_names = set()
 
         for batch_start in range(0, total_pages, batch_size):
             batch_end = min(batch_start + batch_size, total_pages)
@@ -268,40 +744,60 @@ def download_dataset(dataset_num, workers, batch_size, dry_run, browser_context)
             # Scan this batch of pages for PDF links
             batch_links = set()
             for page_num in range(batch_start, batch_end):
-                if page_num > 0:
-                    time.sleep(PAGE_FETCH_DELAY)
-
-                links = fetch_page_links(page, base_url, page_num)
+                if cached_pages is not None:
+                    links = set(cached_pages[page_num])
+                else:
+                    if page_num == 0:
+                        links = first_links
+                    else:
+                        pacer.wait()
+                        links = None
+                        if use_http:
+                            links = fetch_page_links_http(session, base_url, page_num)
+                            if links is None:
+                                use_http = False
+                                print("    Direct HTTP listing blocked — "
+                                      "using the browser for this dataset")
+                        if links is None:
+                            links = fetch_page_links(page, base_url, page_num)
+                        pacer.record(bool(links))
+                    scanned_pages.append(list(links))
+                    scan_complete = scan_complete and bool(links)
                 batch_links.update(links)
 
                 if page_num % 10 == 0 or page_num == batch_end - 1:
                     print(f"    Scanned page {page_num}/{last_page}: "
                           f"{len(links)} links (batch total: {len(batch_links)})")
 
-            batch_links = sorted(batch_links)
-            total_links += len(batch_links)
+            jobs = download_jobs(batch_links, dataset_dir, seen_names,
+                                 existing_names)
+            total_links += len(jobs)
 
             if dry_run:
-                existing = sum(
-                    1 for url in batch_links
-                    if is_valid_pdf(dataset_dir / os.path.basename(url.split("?")[0]))
-                )
-                print(f"    Batch links: {len(batch_links)} "
-                      f"(already downloaded: {existing})")
+                existing = sum(1 for _, path in jobs if path.name in existing_names)
+                print(f"    Batch links: {len(jobs)} "
+                      f"(present locally, unverified: {existing})")
             else:
                 # Download this batch with thread pool
-                print(f"    Downloading {len(batch_links)} PDFs "
+                print(f"    Downloading {len(jobs)} PDFs "
                       f"with {workers} threads...")
-                dl, sk, fl = download_batch(
-                    batch_links, dataset_dir, session, workers,
-                )
+                dl, sk, fl = download_batch(jobs, session, workers,
+                                            existing_names, validators,
+                                            saved_urls, refresh)
+                if dl or refresh:
+                    save_validators(dataset_num, validators)
                 total_downloaded += dl
                 total_skipped += sk
                 total_failed += fl
                 print(f"    Batch done: {dl} downloaded, {sk} skipped, {fl} failed")
 
             # Clear batch from memory
-            del batch_links
+            del batch_links, jobs
+
+        # Only cache a scan where every page returned links; a blocked
+        # page would otherwise be silently missing on the next run.
+        if cached_pages is None and scan_complete:
+            save_url_cache(dataset_num, fingerprint, scanned_pages)
 
         # Summary
         print(f"\n  Data Set {dataset_num} complete:")
@@ -316,12 +812,16 @@ def download_dataset(dataset_num, workers, batch_size, dry_run, browser_context)
         return total_links if dry_run else total_downloaded + total_skipped
 
     finally:
+        if session is not None:
+            session.close()
         page.close()
 
 
 # ─── Main ────────────────────────────────────────────────────
 
 def main():
+    # requests and Playwright are imported where they are used, so --help
+    # and argument errors return without loading them.
     parser = argparse.ArgumentParser(
         description="Epstein DOJ Files Downloader",
         epilog="Examples:\n"
@@ -331,7 +831,9 @@ def main():
                "  python -m src.downloader --workers 10      # 10 threads\n"
                "  python -m src.downloader --batch-size 20   # 20 pages per batch\n"
                "  python -m src.downloader --dry-run         # Count only\n"
-               "  python -m src.downloader --headless        # Headless (page 0 only)\n",
+               "  python -m src.downloader --headless        # Headless (page 0 only)\n"
+               "  python -m src.downloader --rescan          # Ignore link cache\n"
+               "  python -m src.downloader --refresh         # Re-check downloads\n",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     parser.add_argument(
@@ -354,6 +856,15 @@ def main():
         "--headless", action="store_true",
         help="Run browser in headless mode (Akamai blocks pagination in headless)",
     )
+    parser.add_argument(
+        "--rescan", action="store_true",
+        help="Ignore cached link lists and walk every listing page again "
+             "(they also expire after a day)",
+    )
+    parser.add_argument(
+        "--refresh", action="store_true",
+        help="Revalidate downloaded PDFs with conditional GETs (ETag/Last-Modified)",
+    )
     args = parser.parse_args()
 
     datasets = args.dataset or list(range(1, NUM_DATASETS + 1))
@@ -373,11 +884,15 @@ def main():
     print(f"  Browser:    {'headless' if args.headless else 'headed'}")
     if args.dry_run:
         print("  Mode:       DRY RUN (no downloads)")
+    elif args.refresh:
+        print("  Mode:       REFRESH (revalidate existing files)")
     print()
 
     if not args.dry_run:
         PDF_DIR.mkdir(exist_ok=True)
 
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as pw:
         browser = pw.chromium.launch(headless=args.headless)
         context = browser.new_context(
@@ -385,11 +900,19 @@ def main():
         )
 
         grand_total = 0
+        saved_urls = {}
         try:
+            # The user agent is fixed by the browser build; read it once
+            # rather than per dataset.
+            probe = new_stealth_page(context)
+            user_agent = probe.evaluate("() => navigator.userAgent")
+            probe.close()
+
             for dataset_num in datasets:
                 count = download_dataset(
                     dataset_num, args.workers, args.batch_size,
-                    args.dry_run, context,
+                    args.dry_run, context, user_agent, saved_urls,
+                    rescan=args.rescan, refresh=args.refresh,
                 )
                 grand_total += count
                 time.sleep(1)
@@ -2,51 +2,78 @@
 """
 Epstein DOJ Files - PDF to JSON Converter
 Extracts text and metadata from all downloaded PDFs into a searchable JSON file.
-Uses pdftotext/pdfinfo (Poppler) for text extraction.
+Uses pdftotext/pdfinfo (Poppler) subprocesses by default; --backend pymupdf
+extracts in-process with PyMuPDF instead (different text and date format).
 """
 
-import json
+import argparse
+import functools
+import os
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src import jsonio
 from src.config import (
     PROJECT_ROOT, DATA_DIR, PDF_DIR,
-    SOURCE_URL, NUM_DATASETS,
+    SOURCE_URL, NUM_DATASETS, EXTRACT_WORKERS,
     JSON_FULL, JSON_SEARCH_INDEX, JSON_SUMMARY, JSON_FILE_LIST,
 )
 
+# pdfinfo field names for the PyMuPDF metadata keys
+_MUPDF_INFO_KEYS = {
+    "title": "Title",
+    "author": "Author",
+    "subject": "Subject",
+    "creator": "Creator",
+    "producer": "Producer",
+    "creationDate": "CreationDate",
+}
 
-def extract_pdf_text(pdf_path):
-    """Extract text from PDF using pdftotext."""
+
+def _start(args):
+    """Start a Poppler tool with its stdout captured as bytes.
+
+    Poppler writes UTF-8 by default; the caller decodes the whole output
+    once rather than through a locale-dependent text wrapper.
+    """
+    return subprocess.Popen(
+        args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+
+
+def _finish(proc, timeout):
+    """Wait for a started process and return (returncode, stdout)."""
     try:
-        result = subprocess.run(
-            ["pdftotext", "-layout", str(pdf_path), "-"],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-        if result.returncode == 0:
-            return result.stdout
+        stdout, _ = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        raise
+    return proc.returncode, stdout
+
+
+def extract_pdf_text(proc):
+    """Collect the text from a started pdftotext process."""
+    try:
+        returncode, stdout = _finish(proc, 60)
+        if returncode == 0:
+            return stdout.decode("utf-8", errors="replace")
         return ""
     except Exception as e:
         print(f"    Error extracting with pdftotext: {e}")
         return ""
 
 
-def extract_pdf_info(pdf_path):
-    """Get PDF metadata using pdfinfo."""
+def extract_pdf_info(proc):
+    """Collect PDF metadata from a started pdfinfo process."""
     info = {}
     try:
-        result = subprocess.run(
-            ["pdfinfo", str(pdf_path)],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        for line in result.stdout.split("\n"):
+        _, stdout = _finish(proc, 10)
+        for line in stdout.decode("utf-8", errors="replace").split("\n"):
             if ":" in line:
                 key, value = line.split(":", 1)
                 info[key.strip()] = value.strip()
@@ -56,13 +83,97 @@ def extract_pdf_info(pdf_path):
         return {}
 
 
-def process_single_pdf(pdf_path):
+def extract_pdf_poppler(pdf_path, raw=False):
+    """Run pdfinfo and pdftotext side by side; return (pdf_info, full_text).
+
+    Both processes are started before waiting on either, so their startup
+    and PDF parsing overlap instead of running back to back. raw selects
+    pdftotext's content-order -raw mode, which skips the -layout column
+    and spacing analysis; page breaks are kept in both modes.
+    """
+    mode = "-raw" if raw else "-layout"
+    info_proc = _start(["pdfinfo", str(pdf_path)])
+    try:
+        # -eol unix: plain \n line ends on every platform, with no newline
+        # translation needed after decoding
+        text_proc = _start(
+            ["pdftotext", mode, "-eol", "unix", str(pdf_path), "-"],
+        )
+    except OSError:
+        info_proc.kill()
+        info_proc.wait()
+        raise
+    return extract_pdf_info(info_proc), extract_pdf_text(text_proc)
+
+
+def extract_pdf_mupdf(pdf_path):
+    """Get pdfinfo-style metadata and text in-process with PyMuPDF.
+
+    Each page's text is followed by a form feed, as pdftotext does, so
+    create_search_index finds the same page boundaries.
+    """
+    import pymupdf
+
+    try:
+        with pymupdf.open(pdf_path) as doc:
+            metadata = doc.metadata or {}
+            info = {
+                name: metadata[key]
+                for key, name in _MUPDF_INFO_KEYS.items() if metadata.get(key)
+            }
+            info["Pages"] = str(doc.page_count)
+            full_text = "".join(page.get_text("text") + "\f" for page in doc)
+        return info, full_text
+    except Exception as e:
+        print(f"    Error extracting with PyMuPDF: {e}")
+        return {}, ""
+
+
+def extract_pdf(pdf_path, raw=False, backend="poppler"):
+    """Return (pdf_info, full_text) using the selected backend."""
+    if backend == "pymupdf":
+        return extract_pdf_mupdf(pdf_path)
+    return extract_pdf_poppler(pdf_path, raw)
+
+
+def extraction_tool(raw=False, backend="poppler"):
+    """Backend name recorded in the output metadata."""
+    if backend == "pymupdf":
+        return "pymupdf"
+    return "pdftotext -raw/pdfinfo" if raw else "pdftotext/pdfinfo"
+
+
+def count_words(text, chunk_size=1 << 20):
+    """Count whitespace-separated words, exactly as len(text.split()) would.
+
+    Splits one slice at a time so only that slice's words exist at once;
+    a word cut by a slice boundary is counted once.
+    """
+    count = 0
+    ends_in_word = False
+    for start in range(0, len(text), chunk_size):
+        chunk = text[start:start + chunk_size]
+        count += len(chunk.split())
+        if ends_in_word and not chunk[0].isspace():
+            count -= 1
+        ends_in_word = not chunk[-1].isspace()
+    return count
+
+
+def relative_filepath(pdf_path):
+    """Path relative to project root with leading / for absolute URL paths."""
+    try:
+        return "/" + str(pdf_path.relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(pdf_path)
+
+
+def process_single_pdf(pdf_path, raw=False, backend="poppler"):
     """Process a single PDF file."""
     print(f"  Processing: {pdf_path.name}")
 
     stats = pdf_path.stat()
-    pdf_info = extract_pdf_info(pdf_path)
-    full_text = extract_pdf_text(pdf_path)
+    pdf_info, full_text = extract_pdf(pdf_path, raw, backend)
 
     pages = pdf_info.get("Pages", "0")
     try:
@@ -70,15 +181,9 @@ def process_single_pdf(pdf_path):
     except ValueError:
         pages = 0
 
-    # Store path relative to project root with leading / for absolute URL paths
-    try:
-        relative_path = "/" + str(pdf_path.relative_to(PROJECT_ROOT))
-    except ValueError:
-        relative_path = str(pdf_path)
-
     return {
         "filename": pdf_path.name,
-        "filepath": relative_path,
+        "filepath": relative_filepath(pdf_path),
         "size_bytes": stats.st_size,
         "size_mb": round(stats.st_size / (1024 * 1024), 2),
         "modified_date": datetime.fromtimestamp(stats.st_mtime).isoformat(),
@@ -91,12 +196,68 @@ def process_single_pdf(pdf_path):
         "creation_date": pdf_info.get("CreationDate", ""),
         "full_text": full_text,
         "text_length": len(full_text),
-        "word_count": len(full_text.split()),
+        "word_count": count_words(full_text),
+    }
+
+
+def process_pdf_safe(pdf_path, raw=False, backend="poppler"):
+    """Process one PDF in a worker, returning an error record on failure."""
+    try:
+        return process_single_pdf(pdf_path, raw, backend)
+    except Exception as e:
+        print(f"  Error processing {pdf_path.name}: {e}")
+        return {
+            "filename": pdf_path.name,
+            "filepath": str(pdf_path),
+            "error": str(e),
+        }
+
+
+def load_previous_records(tool):
+    """Index the last full JSON's file records by filepath.
+
+    Records are only reused if they came from the same extraction tool
+    and the extraction succeeded. A timeout, tool error or unreadable PDF
+    yields empty text and 0 pages rather than an "error" record, so
+    those are skipped as well and retried on the next run. (A PDF with no
+    text layer still has a form feed per page, so it is not empty.)
+    """
+    try:
+        previous = jsonio.load_file(DATA_DIR / JSON_FULL)
+    except (OSError, ValueError):
+        return {}
+    if previous.get("metadata", {}).get("extraction_tool") != tool:
+        return {}
+    return {
+        file_info["filepath"]: file_info
+        for dataset in previous.get("datasets", [])
+        for file_info in dataset.get("files", [])
+        if "error" not in file_info and "filepath" in file_info
+        and file_info.get("full_text") and file_info.get("pages")
     }
 
 
-def process_all_pdfs():
-    """Process all PDFs and create comprehensive JSON."""
+def reusable_record(pdf_path, previous):
+    """The previous record for pdf_path if its size and mtime are unchanged."""
+    record = previous.get(relative_filepath(pdf_path))
+    if record is None:
+        return None
+    stats = pdf_path.stat()
+    if (record.get("size_bytes") != stats.st_size or record.get("modified_date")
+            != datetime.fromtimestamp(stats.st_mtime).isoformat()):
+        return None
+    return record
+
+
+def process_all_pdfs(workers=EXTRACT_WORKERS, previous=None, raw=False,
+                     backend="poppler"):
+    """Process all PDFs and create comprehensive JSON.
+
+    Files are independent, so each dataset's PDFs are extracted across a
+    pool of worker processes; results come back in filename order.
+    Records in previous (see load_previous_records) whose file is
+    unchanged are reused instead of extracting the PDF again.
+    """
     print("Starting PDF extraction...")
     print("=" * 60)
 
@@ -105,7 +266,7 @@ def process_all_pdfs():
             "extraction_date": datetime.now(timezone.utc).isoformat(),
             "total_datasets": NUM_DATASETS,
             "source": SOURCE_URL,
-            "extraction_tool": "pdftotext/pdfinfo",
+            "extraction_tool": extraction_tool(raw, backend),
             "description": "Epstein DOJ disclosure documents with full text extraction",
         },
         "datasets": [],
@@ -119,57 +280,17 @@ def process_all_pdfs():
     total_size = 0
     total_pages = 0
 
-    for i in range(1, NUM_DATASETS + 1):
-        dataset_dir = PDF_DIR / f"data-set-{i}"
-
-        dataset = {
-            "dataset_number": i,
-            "dataset_name": f"data-set-{i}",
-            "dataset_url": f"{SOURCE_URL}/data-set-{i}-files",
-            "files": [],
-        }
-
-        if not dataset_dir.exists():
-            print(f"Warning: {dataset_dir} does not exist, skipping...")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i in range(1, NUM_DATASETS + 1):
+            dataset = process_dataset(
+                i, pool, workers, previous or {}, raw, backend,
+            )
+            for file_data in dataset["files"]:
+                if "error" not in file_data:
+                    total_files += 1
+                    total_size += file_data["size_mb"]
+                    total_pages += file_data["pages"]
             data["datasets"].append(dataset)
-            continue
-
-        pdf_files = sorted(dataset_dir.glob("*.pdf"))
-        if not pdf_files:
-            print(f"Data Set {i}: No PDF files found")
-            data["datasets"].append(dataset)
-            continue
-
-        print(f"\nData Set {i}: Processing {len(pdf_files)} PDFs")
-        print("-" * 60)
-
-        for pdf_path in pdf_files:
-            try:
-                file_data = process_single_pdf(pdf_path)
-                dataset["files"].append(file_data)
-                total_files += 1
-                total_size += file_data["size_mb"]
-                total_pages += file_data["pages"]
-            except Exception as e:
-                print(f"  Error processing {pdf_path.name}: {e}")
-                dataset["files"].append({
-                    "filename": pdf_path.name,
-                    "filepath": str(pdf_path),
-                    "error": str(e),
-                })
-
-        dataset["file_count"] = len(dataset["files"])
-        dataset["total_pages"] = sum(
-            f.get("pages", 0) for f in dataset["files"] if "pages" in f
-        )
-        dataset["total_size_mb"] = round(
-            sum(f.get("size_mb", 0) for f in dataset["files"] if "size_mb" in f), 2
-        )
-        print(
-            f"  Completed: {dataset['file_count']} files, "
-            f"{dataset['total_pages']} pages, {dataset['total_size_mb']} MB"
-        )
-        data["datasets"].append(dataset)
 
     data["metadata"]["total_files"] = total_files
     data["metadata"]["total_pages"] = total_pages
@@ -178,31 +299,115 @@ def process_all_pdfs():
     return data
 
 
+def list_pdfs(dataset_dir):
+    """Sorted paths of the PDFs in dataset_dir, or None if it is missing.
+
+    One scandir pass, filtering on the entry name and cached file type.
+    """
+    try:
+        with os.scandir(dataset_dir) as entries:
+            names = sorted(
+                entry.name for entry in entries
+                if entry.name.endswith(".pdf") and entry.is_file()
+            )
+    except FileNotFoundError:
+        return None
+    return [dataset_dir / name for name in names]
+
+
+def process_dataset(i, pool, workers, previous, raw=False, backend="poppler"):
+    """Extract one dataset's PDFs on the pool and build its dataset record."""
+    dataset_dir = PDF_DIR / f"data-set-{i}"
+
+    dataset = {
+        "dataset_number": i,
+        "dataset_name": f"data-set-{i}",
+        "dataset_url": f"{SOURCE_URL}/data-set-{i}-files",
+        "files": [],
+    }
+
+    pdf_files = list_pdfs(dataset_dir)
+    if pdf_files is None:
+        print(f"Warning: {dataset_dir} does not exist, skipping...")
+        return dataset
+    if not pdf_files:
+        print(f"Data Set {i}: No PDF files found")
+        return dataset
+
+    print(f"\nData Set {i}: Processing {len(pdf_files)} PDFs")
+    print("-" * 60)
+
+    files = [reusable_record(pdf_path, previous) for pdf_path in pdf_files]
+    pending = [n for n, record in enumerate(files) if record is None]
+    if len(pending) < len(files):
+        print(f"  Reusing {len(files) - len(pending)} unchanged file(s)")
+
+    # Several files per task keeps pickling overhead low on large datasets
+    chunksize = max(1, len(pending) // (workers * 4))
+    results = pool.map(
+        functools.partial(process_pdf_safe, raw=raw, backend=backend),
+        [pdf_files[n] for n in pending], chunksize=chunksize,
+    )
+    for n, record in zip(pending, results):
+        files[n] = record
+    dataset["files"] = files
+
+    dataset["file_count"] = len(dataset["files"])
+    dataset["total_pages"] = sum(
+        f.get("pages", 0) for f in dataset["files"] if "pages" in f
+    )
+    dataset["total_size_mb"] = round(
+        sum(f.get("size_mb", 0) for f in dataset["files"] if "size_mb" in f), 2
+    )
+    print(
+        f"  Completed: {dataset['file_count']} files, "
+        f"{dataset['total_pages']} pages, {dataset['total_size_mb']} MB"
+    )
+    return dataset
+
+
 def create_search_index(data):
-    """Create a simplified flat search index."""
-    search_index = []
+    """Yield the entries of a simplified flat search index.
+
+    A generator, so save_json_files can write each entry as it is built.
+    """
     for dataset in data["datasets"]:
         for file_info in dataset["files"]:
             if "full_text" in file_info and "error" not in file_info:
                 full_text = file_info["full_text"]
 
-                # Split on form-feed characters to find page boundaries
-                pages_text = full_text.split('\f')
-                page_offsets = []
-                offset = 0
-                for page_text in pages_text:
-                    page_offsets.append(offset)
-                    offset += len(page_text) + 1  # +1 for the \f character
+                # Each page starts just after a form-feed character; find()
+                # scans for them without slicing the text into pages.
+                page_offsets = [0]
+                offset = full_text.find('\f')
+                while offset != -1:
+                    page_offsets.append(offset + 1)
+                    offset = full_text.find('\f', offset + 1)
 
-                search_index.append({
+                yield {
                     "dataset": dataset["dataset_number"],
                     "filename": file_info["filename"],
                     "filepath": file_info["filepath"],
                     "pages": file_info.get("pages", 0),
                     "text": full_text,
                     "page_offsets": page_offsets,
-                })
-    return search_index
+                }
+
+
+def summarize_file(file_info):
+    """Copy of a file record with full_text replaced by a short preview.
+
+    Only the record itself is copied; the other values are shared with
+    the full data rather than deep-copied.
+    """
+    if "full_text" not in file_info:
+        return file_info
+    summary = {k: v for k, v in file_info.items() if k != "full_text"}
+    full_text = file_info["full_text"]
+    summary["text_preview"] = (
+        full_text[:500] + "..." if len(full_text) > 500 else full_text
+    )
+    return summary
 
 
 def save_json_files(data):
@@ -215,38 +420,37 @@ def save_json_files(data):
 
     files_created = []
 
+    # The large outputs are written one file record at a time, so peak
+    # memory is the extracted data plus a single serialized record. The
+    # full JSON and search index are only read by search/server, so they
+    # are written compact; the summary and file list stay indented.
+
     # 1. Full JSON
     full_path = DATA_DIR / JSON_FULL
     print(f"Creating: {full_path}")
-    with open(full_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    jsonio.dump_file_streamed(full_path, data)
     files_created.append(str(full_path))
     print(f"  Size: {full_path.stat().st_size / (1024 * 1024):.1f} MB")
 
     # 2. Summary JSON (no full text)
-    summary_data = json.loads(json.dumps(data))
-    for dataset in summary_data["datasets"]:
-        for file_info in dataset["files"]:
-            if "full_text" in file_info:
-                full_text = file_info["full_text"]
-                file_info["text_preview"] = (
-                    full_text[:500] + "..." if len(full_text) > 500 else full_text
-                )
-                del file_info["full_text"]
+    summary_data = {
+        "metadata": data["metadata"],
+        "datasets": (
+            {**dataset, "files": (summarize_file(f) for f in dataset["files"])}
+            for dataset in data["datasets"]
+        ),
+    }
 
     summary_path = DATA_DIR / JSON_SUMMARY
     print(f"Creating: {summary_path}")
-    with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(summary_data, f, indent=2, ensure_ascii=False)
+    jsonio.dump_file_streamed(summary_path, summary_data, indent=True)
     files_created.append(str(summary_path))
     print(f"  Size: {summary_path.stat().st_size / (1024 * 1024):.1f} MB")
 
     # 3. Search index (flat)
-    search_index = create_search_index(data)
     search_path = DATA_DIR / JSON_SEARCH_INDEX
     print(f"Creating: {search_path}")
-    with open(search_path, "w", encoding="utf-8") as f:
-        json.dump(search_index, f, indent=2, ensure_ascii=False)
+    jsonio.dump_file_streamed(search_path, create_search_index(data))
     files_created.append(str(search_path))
     print(f"  Size: {search_path.stat().st_size / (1024 * 1024):.1f} MB")
 
@@ -265,8 +469,7 @@ def save_json_files(data):
 
     list_path = DATA_DIR / JSON_FILE_LIST
     print(f"Creating: {list_path}")
-    with open(list_path, "w", encoding="utf-8") as f:
-        json.dump(file_list, f, indent=2, ensure_ascii=False)
+    jsonio.dump_file(list_path, file_list, indent=True)
     files_created.append(str(list_path))
     print(f"  Size: {list_path.stat().st_size / (1024 * 1024):.1f} MB")
 
@@ -297,19 +500,51 @@ def print_summary(data):
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Epstein DOJ Files - PDF to JSON Converter",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Re-extract every PDF instead of reusing unchanged records "
+             "from the previous full JSON",
+    )
+    parser.add_argument(
+        "--raw", action="store_true",
+        help="Use pdftotext -raw (content order, faster) instead of -layout",
+    )
+    parser.add_argument(
+        "--backend", choices=["poppler", "pymupdf"], default="poppler",
+        help="Extraction backend (default: poppler). pymupdf runs in-process "
+             "but produces different text and raw PDF creation dates",
+    )
+    args = parser.parse_args()
+    if args.raw and args.backend != "poppler":
+        parser.error("--raw only applies to the poppler backend")
+
     print("Epstein DOJ Files - PDF to JSON Converter")
     print("=" * 60)
     print()
 
     # Check for required tools
-    try:
-        subprocess.run(["pdftotext", "-v"], capture_output=True, timeout=5)
-    except FileNotFoundError:
-        print("Error: pdftotext not found")
-        print("Install with: brew install poppler")
-        sys.exit(1)
-
-    data = process_all_pdfs()
+    if args.backend == "pymupdf":
+        try:
+            import pymupdf  # noqa: F401
+        except ImportError:
+            print("Error: PyMuPDF not installed")
+            print("Install with: pip install pymupdf")
+            sys.exit(1)
+    else:
+        try:
+            subprocess.run(["pdftotext", "-v"], capture_output=True, timeout=5)
+        except FileNotFoundError:
+            print("Error: pdftotext not found")
+            print("Install with: brew install poppler")
+            sys.exit(1)
+
+    tool = extraction_tool(args.raw, args.backend)
+    previous = {} if args.force else load_previous_records(tool)
+    data = process_all_pdfs(previous=previous, raw=args.raw, backend=args.backend)
+    del previous
     if data is None:
         print("Error: Could not process PDFs")
         sys.exit(1)
@@ -325,9 +560,12 @@ def main():
         print(f"  - {f}")
 
     print("\nUsage:")
-    print("  python -m src.extractor   # Re-run extraction")
-    print("  python -m src.search      # CLI search")
-    print("  python -m src.server      # Start web interface")
+    print("  python -m src.extractor           # Re-run extraction (unchanged PDFs reused)")
+    print("  python -m src.extractor --force   # Re-extract every PDF")
+    print("  python -m src.extractor --raw     # Faster pdftotext -raw text")
+    print("  python -m src.extractor --backend pymupdf  # In-process extraction")
+    print("  python -m src.search              # CLI search")
+    print("  python -m src.server              # Start web interface")
 
 
 if __name__ == "__main__":
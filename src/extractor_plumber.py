@@ -4,22 +4,77 @@ Alternative PDF extractor using pdfplumber (pure Python, no external tools neede
 Use this if poppler (pdftotext/pdfinfo) is not available.
 """
 
-import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
 import pdfplumber
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src import jsonio
 from src.config import (
-    DATA_DIR, PDF_DIR, NUM_DATASETS, SOURCE_URL,
+    DATA_DIR, PDF_DIR, NUM_DATASETS, SOURCE_URL, EXTRACT_WORKERS,
     JSON_FULL, JSON_SUMMARY,
 )
+from src.extractor import list_pdfs
+
+
+def extract_file(pdf_path):
+    """Extract one PDF with pdfplumber, returning an error record on failure."""
+    print(f"  Extracting: {pdf_path.name}")
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            metadata = pdf.metadata
+            full_text = ""
+            pages_data = []
+
+            for page_num, page in enumerate(pdf.pages, 1):
+                page_text = page.extract_text() or ""
+                full_text += page_text + "\n\n"
+                tables = page.extract_tables()
+                pages_data.append({
+                    "page_number": page_num,
+                    "text": page_text,
+                    "has_tables": len(tables) > 0,
+                    "table_count": len(tables),
+                    "tables": tables if tables else [],
+                })
+
+            size_bytes = pdf_path.stat().st_size
+            return {
+                "filename": pdf_path.name,
+                "filepath": str(pdf_path),
+                "size_bytes": size_bytes,
+                "size_mb": round(size_bytes / (1024 * 1024), 2),
+                "page_count": len(pdf.pages),
+                "metadata": {
+                    "title": metadata.get("Title", ""),
+                    "author": metadata.get("Author", ""),
+                    "subject": metadata.get("Subject", ""),
+                    "creator": metadata.get("Creator", ""),
+                    "producer": metadata.get("Producer", ""),
+                    "creation_date": str(metadata.get("CreationDate", "")),
+                },
+                "full_text": full_text.strip(),
+                "text_length": len(full_text),
+                "pages": pages_data,
+            }
+
+    except Exception as e:
+        print(f"    Error processing {pdf_path.name}: {e}")
+        return {
+            "filename": pdf_path.name,
+            "error": str(e),
+        }
+
 
+def process_pdfs(num_datasets=NUM_DATASETS, workers=EXTRACT_WORKERS):
+    """Process PDFs with pdfplumber for better text extraction.
 
-def process_pdfs(num_datasets=NUM_DATASETS):
-    """Process PDFs with pdfplumber for better text extraction."""
+    pdfplumber is pure Python, so files are spread over worker processes
+    rather than threads; results keep filename order.
+    """
     data = {
         "metadata": {
             "extraction_date": datetime.now(timezone.utc).isoformat(),
@@ -30,101 +85,70 @@ def process_pdfs(num_datasets=NUM_DATASETS):
         "datasets": [],
     }
 
-    for i in range(1, num_datasets + 1):
-        dataset_dir = PDF_DIR / f"data-set-{i}"
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i in range(1, num_datasets + 1):
+            dataset_dir = PDF_DIR / f"data-set-{i}"
 
-        dataset = {
-            "dataset_number": i,
-            "dataset_name": f"data-set-{i}",
-            "files": [],
-        }
+            dataset = {
+                "dataset_number": i,
+                "dataset_name": f"data-set-{i}",
+                "files": [],
+            }
 
-        if not dataset_dir.exists():
-            data["datasets"].append(dataset)
-            continue
-
-        pdf_files = sorted(dataset_dir.glob("*.pdf"))
-        print(f"Processing Data Set {i}: {len(pdf_files)} PDFs")
-
-        for pdf_path in pdf_files:
-            print(f"  Extracting: {pdf_path.name}")
-            try:
-                with pdfplumber.open(pdf_path) as pdf:
-                    metadata = pdf.metadata
-                    full_text = ""
-                    pages_data = []
-
-                    for page_num, page in enumerate(pdf.pages, 1):
-                        page_text = page.extract_text() or ""
-                        full_text += page_text + "\n\n"
-                        tables = page.extract_tables()
-                        pages_data.append({
-                            "page_number": page_num,
-                            "text": page_text,
-                            "has_tables": len(tables) > 0,
-                            "table_count": len(tables),
-                            "tables": tables if tables else [],
-                        })
-
-                    file_data = {
-                        "filename": pdf_path.name,
-                        "filepath": str(pdf_path),
-                        "size_bytes": pdf_path.stat().st_size,
-                        "size_mb": round(pdf_path.stat().st_size / (1024 * 1024), 2),
-                        "page_count": len(pdf.pages),
-                        "metadata": {
-                            "title": metadata.get("Title", ""),
-                            "author": metadata.get("Author", ""),
-                            "subject": metadata.get("Subject", ""),
-                            "creator": metadata.get("Creator", ""),
-                            "producer": metadata.get("Producer", ""),
-                            "creation_date": str(metadata.get("CreationDate", "")),
-                        },
-                        "full_text": full_text.strip(),
-                        "text_length": len(full_text),
-                        "pages": pages_data,
-                    }
-                    dataset["files"].append(file_data)
-
-            except Exception as e:
-                print(f"    Error processing {pdf_path.name}: {e}")
-                dataset["files"].append({
-                    "filename": pdf_path.name,
-                    "error": str(e),
-                })
+            pdf_files = list_pdfs(dataset_dir)
+            if pdf_files is None:
+                data["datasets"].append(dataset)
+                continue
 
-        dataset["file_count"] = len(dataset["files"])
-        data["datasets"].append(dataset)
+            print(f"Processing Data Set {i}: {len(pdf_files)} PDFs")
+
+            chunksize = max(1, len(pdf_files) // (workers * 4))
+            dataset["files"] = list(pool.map(extract_file, pdf_files, chunksize=chunksize))
+
+            dataset["file_count"] = len(dataset["files"])
+            data["datasets"].append(dataset)
 
     return data
 
 
+def summarize_file(file_info):
+    """Copy of a file record without its text, for the summary JSON.
+
+    Only the record and its page entries are copied; tables and metadata
+    are shared with the full data rather than deep-copied.
+    """
+    summary = {k: v for k, v in file_info.items() if k != "full_text"}
+    if "pages" in summary:
+        summary["pages"] = [
+            {k: v for k, v in page.items() if k != "text"}
+            for page in summary["pages"]
+        ]
+    if "full_text" in file_info:
+        summary["text_preview"] = file_info["full_text"][:500] + "..."
+    return summary
+
+
 def main():
     print("Starting PDF extraction with pdfplumber...")
 
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     data = process_pdfs()
 
-    # Save full JSON
+    # Save full JSON (compact: read by search/server, not by people)
     full_path = DATA_DIR / JSON_FULL
-    with open(full_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    jsonio.dump_file(full_path, data)
 
     # Save summary JSON (without full text)
-    summary_data = json.loads(json.dumps(data))
-    for dataset in summary_data["datasets"]:
-        for file in dataset["files"]:
-            if "full_text" in file:
-                file["text_preview"] = file["full_text"][:500] + "..."
-                del file["full_text"]
-            if "pages" in file:
-                for page in file["pages"]:
-                    if "text" in page:
-                        del page["text"]
+    summary_data = {
+        "metadata": data["metadata"],
+        "datasets": [
+            {**dataset, "files": [summarize_file(f) for f in dataset["files"]]}
+            for dataset in data["datasets"]
+        ],
+    }
 
     summary_path = DATA_DIR / JSON_SUMMARY
-    with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(summary_data, f, indent=2, ensure_ascii=False)
+    jsonio.dump_file(summary_path, summary_data, indent=True)
 
     print("\nExtraction complete!")
     print("Files created:")
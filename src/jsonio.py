@@ -0,0 +1,102 @@
+"""
+JSON read/write helpers shared by the downloader and extractor.
+Uses orjson when it is installed and falls back to the stdlib json module.
+"""
+
+import json
+import os
+from types import GeneratorType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj, indent=False):
+    """Serialize obj to UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_file(path, obj, indent=False):
+    """Write obj as JSON to path atomically (temp file + rename)."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(dumps(obj, indent=indent))
+    os.replace(tmp_path, path)
+
+
+def dump_file_streamed(path, obj, indent=False, depth=4):
+    """Write obj as JSON to path like dump_file, one piece at a time.
+
+    Dicts, lists and generators in the top `depth` levels are written
+    member by member; anything deeper is serialized with a single dumps()
+    call. The whole document is never held in memory as bytes, and
+    generators let callers produce records while they are written. The
+    output is byte-for-byte what dump_file would write.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb", buffering=1 << 20) as f:
+        _write_streamed(f.write, obj, indent, depth, 0)
+    os.replace(tmp_path, path)
+
+
+def _write_streamed(write, obj, indent, depth, level):
+    if depth <= 0 or not isinstance(obj, (dict, list, tuple, GeneratorType)):
+        data = dumps(obj, indent=indent)
+        if indent and level:
+            # Nested pretty-printed values must carry their parent's indent.
+            # Raw newlines only occur between tokens (never inside strings).
+            data = data.replace(b"\n", b"\n" + b"  " * level)
+        write(data)
+        return
+
+    is_dict = isinstance(obj, dict)
+    newline = b"\n" + b"  " * (level + 1) if indent else b""
+    write(b"{" if is_dict else b"[")
+    first = True
+    for item in (obj.items() if is_dict else obj):
+        write(newline if first else b"," + newline)
+        first = False
+        if is_dict:
+            key, item = item
+            write(_dump_key(key))
+            write(b": " if indent else b":")
+        _write_streamed(write, item, indent, depth - 1, level + 1)
+    if indent and not first:
+        write(b"\n" + b"  " * level)
+    write(b"}" if is_dict else b"]")
+
+
+def _dump_key(key):
+    """Serialize a dict key exactly as dumps() would inside its dict.
+
+    Non-str keys (ints, floats, bools, None) become JSON strings the same
+    way OPT_NON_STR_KEYS / the stdlib json module convert them.
+    """
+    if isinstance(key, str):
+        return dumps(key)
+    # b'{' + key + b':null}'
+    return dumps({key: None})[1:-6]
+
+
+def load_file(path):
+    """Read and parse a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
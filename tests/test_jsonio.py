@@ -0,0 +1,59 @@
+"""
+Tests for src.jsonio. Run with: python -m unittest discover tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src import jsonio
+
+SAMPLES = [
+    {"a": {1: "x"}},
+    {1: [1, 2], 2.5: None, True: {"nested": {None: "y", "z": [3]}}},
+    {"datasets": [{"files": [{"name": "a.pdf", "pages": 2}], "size": 0}], "empty": {}},
+    [{"k": []}, [], "text with\nnewline", 1.5, None],
+    {},
+]
+
+
+class DumpFileStreamedTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _both(self, obj, indent, depth=4):
+        plain = self.tmp / "plain.json"
+        streamed = self.tmp / "streamed.json"
+        jsonio.dump_file(plain, obj, indent=indent)
+        jsonio.dump_file_streamed(streamed, obj, indent=indent, depth=depth)
+        return plain.read_bytes(), streamed.read_bytes()
+
+    def test_matches_dump_file(self):
+        for obj in SAMPLES:
+            for indent in (False, True):
+                for depth in (0, 1, 4):
+                    with self.subTest(obj=obj, indent=indent, depth=depth):
+                        plain, streamed = self._both(obj, indent, depth)
+                        self.assertEqual(streamed, plain)
+
+    def test_non_str_keys_are_quoted(self):
+        _, streamed = self._both({"a": {1: "x"}}, indent=False)
+        self.assertEqual(streamed, b'{"a":{"1":"x"}}')
+
+    def test_generators_stream_as_lists(self):
+        records = [{"id": i} for i in range(3)]
+        plain = self.tmp / "plain.json"
+        streamed = self.tmp / "streamed.json"
+        jsonio.dump_file(plain, {"records": records})
+        jsonio.dump_file_streamed(streamed, {"records": (r for r in records)})
+        self.assertEqual(streamed.read_bytes(), plain.read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()